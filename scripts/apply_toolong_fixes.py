@@ -6,23 +6,34 @@ Reads each *_toolong.csv file from translations/toolong_reports/
 and updates the corresponding batch file with the shortened English translations.
 """
 import csv
-import io
 from pathlib import Path
 
+from csv_utils import denul, replace_file
+
 
 def load_toolong_fixes(toolong_path: Path) -> dict:
     """Load fixes from a toolong CSV. Returns dict mapping japanese -> new english."""
     fixes = {}
     
     with open(toolong_path, 'r', encoding='utf-8') as f:
-        content = f.read().replace('\x00', '')
-    
-    reader = csv.DictReader(io.StringIO(content))
-    for row in reader:
-        jp = row.get('japanese', '').strip()
-        en = row.get('english', '').strip()
-        if jp and en:
-            fixes[jp] = en
+        reader = csv.reader(denul(f))
+        header = next(reader, [])
+        if 'japanese' not in header or 'english' not in header:
+            return fixes
+        japanese_idx = header.index('japanese')
+        english_idx = header.index('english')
+        width = max(japanese_idx, english_idx) + 1
+        
+        for row in reader:
+            if not row:
+                continue
+            # Short rows read as empty in the missing columns
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            jp = row[japanese_idx].strip()
+            en = row[english_idx].strip()
+            if jp and en:
+                fixes[jp] = en
     
     return fixes
 
@@ -32,37 +43,42 @@ def apply_fixes_to_batch(batch_path: Path, fixes: dict) -> tuple[int, list]:
     Apply fixes to a batch file.
     Returns (number of fixes applied, list of unmatched japanese texts).
     """
-    # Read original batch file
-    with open(batch_path, 'r', encoding='utf-8') as f:
-        content = f.read().replace('\x00', '')
-    
-    reader = csv.DictReader(io.StringIO(content))
-    fieldnames = reader.fieldnames
-    rows = list(reader)
-    
     # Track what we matched
     matched_jp = set()
     fixes_applied = 0
     
-    # Apply fixes
-    for row in rows:
-        jp = row.get('japanese', '').strip()
-        if jp in fixes:
-            old_en = row.get('english', '')
-            new_en = fixes[jp]
-            if old_en != new_en:
-                row['english'] = new_en
-                fixes_applied += 1
-            matched_jp.add(jp)
-    
-    # Find unmatched
-    unmatched = [jp for jp in fixes.keys() if jp not in matched_jp]
-    
-    # Write back
-    with open(batch_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
-        writer.writeheader()
-        writer.writerows(rows)
+    # Stream rows from the original batch into a replacement file, applying
+    # fixes as we go
+    with open(batch_path, 'r', encoding='utf-8') as src, replace_file(batch_path) as dst:
+        reader = csv.reader(denul(src))
+        writer = csv.writer(dst, quoting=csv.QUOTE_ALL)
+        
+        header = next(reader)
+        japanese_idx = header.index('japanese')
+        english_idx = header.index('english')
+        writer.writerow(header)
+        width = len(header)
+        
+        for row in reader:
+            if not row:
+                continue
+            # Pad short rows out to the header, with the missing columns empty
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            jp = row[japanese_idx].strip()
+            if jp in fixes:
+                new_en = fixes[jp]
+                if row[english_idx] != new_en:
+                    row[english_idx] = new_en
+                    fixes_applied += 1
+                matched_jp.add(jp)
+            writer.writerow(row)
+    
+    # Find unmatched (usually none, so skip the scan when everything matched)
+    if len(matched_jp) == len(fixes):
+        unmatched = []
+    else:
+        unmatched = [jp for jp in fixes if jp not in matched_jp]
     
     return fixes_applied, unmatched
 
@@ -85,8 +101,9 @@ def main():
     print(f"Found {len(toolong_files)} toolong report files")
     print("=" * 80)
     
-    total_fixes = 0
-    all_unmatched = []
+    # Load every report up front, grouping fixes by the batch they target,
+    # so each batch file is read and rewritten exactly once.
+    fixes_by_batch = {}
     
     for toolong_path in toolong_files:
         # Derive original batch filename
@@ -101,11 +118,14 @@ def main():
         # Load fixes
         fixes = load_toolong_fixes(toolong_path)
         
-        if not fixes:
-            continue
-        
-        # Apply fixes
-        fixes_applied, unmatched = apply_fixes_to_batch(batch_path, fixes)
+        if fixes:
+            fixes_by_batch.setdefault(batch_name, {}).update(fixes)
+    
+    total_fixes = 0
+    all_unmatched = []
+    
+    for batch_name, fixes in fixes_by_batch.items():
+        fixes_applied, unmatched = apply_fixes_to_batch(batch_dir / batch_name, fixes)
         
         if fixes_applied > 0 or unmatched:
             print(f"{batch_name}: {fixes_applied} fixes applied", end="")
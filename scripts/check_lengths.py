@@ -6,9 +6,13 @@ These will be truncated during replacement and may cause issues.
 Works with MGDATA_00000062.csv and MGDATA_00000063.csv.
 Outputs a _toolong.csv file for each file with issues.
 """
+import codecs
 import csv
+import functools
 from pathlib import Path
 
+_sjis_encode = codecs.getencoder('shift_jis')
+
 
 def get_byte_length(text: str) -> int:
     """Get the byte length of text in Shift-JIS encoding.
@@ -17,9 +21,18 @@ def get_byte_length(text: str) -> int:
     and doesn't count toward displayed text length, so we exclude it.
     """
     text = text.replace('/', '')
+    # Pure ASCII is one byte per character in Shift-JIS; skip the codec
+    if text.isascii():
+        return len(text)
+    return _sjis_byte_length(text)
+
 
+@functools.lru_cache(maxsize=65536)
+def _sjis_byte_length(text: str) -> int:
+    """Shift-JIS byte length of text, memoized (Japanese lines repeat a lot)."""
     try:
-        return len(text.encode('shift_jis'))
+        encoded, _ = _sjis_encode(text, 'strict')
+        return len(encoded)
     except UnicodeEncodeError:
         length = 0
         for char in text:
@@ -35,11 +48,23 @@ def check_csv(csv_path: Path) -> list:
     issues = []
 
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for line_num, row in enumerate(reader, start=2):
-            jp = row['Japanese']
-            en = row['English']
-            offset = row['offset']
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if not all(name in header for name in ('Japanese', 'English', 'offset')):
+            return issues
+        jp_idx = header.index('Japanese')
+        en_idx = header.index('English')
+        offset_idx = header.index('offset')
+        width = max(jp_idx, en_idx, offset_idx) + 1
+
+        # Blank lines are skipped without counting, as csv.DictReader does
+        for line_num, row in enumerate(filter(None, reader), start=2):
+            if len(row) < width:
+                # Missing trailing cells read as None, as csv.DictReader fills them
+                row += [None] * (width - len(row))
+            jp = row[jp_idx]
+            en = row[en_idx]
+            offset = row[offset_idx]
 
             if not jp or not en:
                 continue
@@ -47,6 +72,10 @@ def check_csv(csv_path: Path) -> list:
             jp_bytes = get_byte_length(jp)
             if jp_bytes % 2:
                 jp_bytes -= 1
+
+            # ASCII English is at most len(en) bytes; most rows pass here
+            if en.isascii() and len(en) <= jp_bytes:
+                continue
             en_bytes = get_byte_length(en)
 
             if en_bytes > jp_bytes:
@@ -73,17 +102,9 @@ def write_issues_csv(source_path: Path, issues: list, output_dir: Path) -> Path:
 
     with open(output_path, 'w', encoding='utf-8', newline='') as f:
         writer = csv.writer(f, quoting=csv.QUOTE_ALL, doublequote=True)
-        writer.writerow(['Japanese', 'English', 'offset', 'jp_bytes', 'en_bytes', 'overflow'])
-
-        for issue in issues:
-            writer.writerow([
-                issue['Japanese'],
-                issue['English'],
-                issue['offset'],
-                issue['jp_bytes'],
-                issue['en_bytes'],
-                issue['overflow'],
-            ])
+        columns = ['Japanese', 'English', 'offset', 'jp_bytes', 'en_bytes', 'overflow']
+        writer.writerow(columns)
+        writer.writerows([issue[col] for col in columns] for issue in issues)
 
     return output_path
 
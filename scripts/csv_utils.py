@@ -0,0 +1,58 @@
+"""
+Shared helpers for the scripts that read and write translation CSVs.
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Mode given to a newly created output file (what open(..., 'w') gives
+# under the usual 022 umask)
+DEFAULT_FILE_MODE = 0o644
+
+# Output buffer for CSV writes (1 MiB): fewer write syscalls on large dumps
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def csv_quote(field: str) -> str:
+    """Quote a CSV field the way csv.QUOTE_ALL does (embedded quotes doubled)."""
+    return '"' + field.replace('"', '""') + '"'
+
+
+def denul(lines):
+    """Yield lines from a text-mode file with stray NUL characters removed."""
+    for line in lines:
+        yield line.replace('\x00', '')
+
+
+@contextlib.contextmanager
+def replace_file(path: Path):
+    """
+    Write a replacement for path through a temp file in the same directory.
+    
+    Yields the temp file, open for UTF-8 text with newline=''. When the block
+    finishes, the temp file takes the place of path's real file (a symlinked
+    path stays a symlink) with that file's mode, or DEFAULT_FILE_MODE if it
+    doesn't exist yet. If anything fails, the temp file is closed and removed
+    and the original is left untouched.
+    """
+    target = os.path.realpath(path)
+    tmp = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', newline='', dir=os.path.dirname(target),
+        prefix=Path(path).stem + '_', suffix='.tmp', delete=False,
+    )
+    try:
+        with tmp:
+            yield tmp
+        # The temp file is created 0600
+        if os.path.exists(target):
+            shutil.copymode(target, tmp.name)
+        else:
+            os.chmod(tmp.name, DEFAULT_FILE_MODE)
+        os.replace(tmp.name, target)
+    except BaseException:
+        # Close before removing: Windows can't delete a file that is open
+        tmp.close()
+        os.unlink(tmp.name)
+        raise
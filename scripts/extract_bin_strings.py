@@ -7,201 +7,201 @@ Outputs a CSV with "japanese" and blank "english" columns.
 import os
 import sys
 import csv
+import mmap
 from pathlib import Path
 from typing import List, Tuple
 
 
-def is_shift_jis_char(b1: int, b2: int = None) -> bool:
-    """Check if byte(s) represent a valid Shift-JIS character"""
-    if b2 is None:
-        return (0x20 <= b1 <= 0x7E) or (0xA1 <= b1 <= 0xDF)
-    
-    if (0x81 <= b1 <= 0x9F) or (0xE0 <= b1 <= 0xFC):
-        if (0x40 <= b2 <= 0x7E) or (0x80 <= b2 <= 0xFC):
-            return True
-    return False
-
-
-def is_hiragana_sjis(b1: int, b2: int) -> bool:
-    """Check if double-byte is Hiragana (0x829F-0x82F1 in Shift-JIS)"""
-    if b1 == 0x82:
-        return 0x9F <= b2 <= 0xF1
-    return False
-
-
-def is_katakana_sjis(b1: int, b2: int) -> bool:
-    """Check if double-byte is Katakana (0x8340-0x8396 in Shift-JIS)"""
-    if b1 == 0x83:
-        return 0x40 <= b2 <= 0x96
-    return False
+# Bytes classified per bytes.translate call in _scan_spans; bounds the copy
+# made from an mmap'd input
+SCAN_SLAB_SIZE = 64 * 1024
 
+# Byte classification table for the scanner: one lookup per byte instead of
+# a chain of range comparisons.
+CLS_ASCII = 0x01      # Printable ASCII (0x20-0x7E)
+CLS_LEAD = 0x02       # Shift-JIS double-byte lead (0x81-0x9F, 0xE0-0xFC)
+CLS_KANA = 0x04       # Half-width katakana (0xA1-0xDF)
+CLS_NEWLINE = 0x08    # \n, \r
+CLS_JP_LEAD = 0x10    # Lead bytes counted as Japanese (0x81-0x9F, 0xE0-0xEF)
+CLS_TRAIL = 0x20      # Valid Shift-JIS trail byte (0x40-0x7E, 0x80-0xFC)
 
-def is_fullwidth_ascii(b1: int, b2: int) -> bool:
-    """Check if double-byte is fullwidth ASCII (0x8140-0x8197 range)"""
-    if b1 == 0x82:
-        return 0x4F <= b2 <= 0x58  # Fullwidth 0-9
-    if b1 == 0x82:
-        return 0x60 <= b2 <= 0x79  # Fullwidth A-Z
-    if b1 == 0x82:
-        return 0x81 <= b2 <= 0x9A  # Fullwidth a-z
-    return False
+BYTE_CLASS = bytearray(256)
+for _b in range(0x20, 0x7F):
+    BYTE_CLASS[_b] |= CLS_ASCII
+for _b in list(range(0x81, 0xA0)) + list(range(0xE0, 0xFD)):
+    BYTE_CLASS[_b] |= CLS_LEAD
+for _b in range(0xA1, 0xE0):
+    BYTE_CLASS[_b] |= CLS_KANA
+for _b in (0x0A, 0x0D):
+    BYTE_CLASS[_b] |= CLS_NEWLINE
+for _b in list(range(0x81, 0xA0)) + list(range(0xE0, 0xF0)):
+    BYTE_CLASS[_b] |= CLS_JP_LEAD
+for _b in list(range(0x40, 0x7F)) + list(range(0x80, 0xFD)):
+    BYTE_CLASS[_b] |= CLS_TRAIL
+del _b
 
 
-def extract_strings(data: bytes, min_length: int = 3, min_japanese: int = 1) -> List[Tuple[int, str]]:
+def _scan_spans(data: bytes):
     """
-    Extract Japanese text strings from binary data.
+    Scan binary data for runs of plausible Shift-JIS text.
     
-    Args:
-        data: Binary data to scan
-        min_length: Minimum string length to include
-        min_japanese: Minimum number of Japanese characters required
+    Pure byte-level scanner (no decoding): yields (start, end, japanese_chars)
+    for every maximal run of printable ASCII, newlines, half-width katakana
+    and valid double-byte characters. Runs containing half-width katakana are
+    rejected here rather than after decoding.
     
-    Returns:
-        List of (offset, decoded_string) tuples
+    The buffer is classified in SCAN_SLAB_SIZE slabs with bytes.translate, so
+    the loops below index class codes directly while never copying more than
+    one slab of an mmap at a time. Each slab carries one extra byte so a lead
+    byte on its last position can still see its trail byte; j is the index
+    within the current slab, which starts at data offset base.
     """
-    results = []
-    i = 0
+    n = len(data)
+    base = 0
+    cls = data[:SCAN_SLAB_SIZE + 1].translate(BYTE_CLASS)
+    size = min(SCAN_SLAB_SIZE, n)
+    j = 0
     
-    while i < len(data) - 1:
-        b1 = data[i]
+    while base + j < n - 1:
+        if j >= size:
+            base += j
+            cls = data[base:base + SCAN_SLAB_SIZE + 1].translate(BYTE_CLASS)
+            size = min(SCAN_SLAB_SIZE, n - base)
+            j = 0
         
         # Look for potential start of Japanese text
         # Double-byte Shift-JIS lead byte or printable ASCII
-        if not ((0x81 <= b1 <= 0x9F) or (0xE0 <= b1 <= 0xFC) or (0x20 <= b1 <= 0x7E)):
-            i += 1
+        if not (cls[j] & (CLS_LEAD | CLS_ASCII)):
+            j += 1
             continue
         
-        # Try to extract a string starting here
-        start = i
-        string_bytes = bytearray()
+        start = base + j
         japanese_chars = 0
+        has_kana = False
         
-        while i < len(data):
-            b1 = data[i]
+        while True:
+            if j >= size:
+                if base + j >= n:
+                    break
+                base += j
+                cls = data[base:base + SCAN_SLAB_SIZE + 1].translate(BYTE_CLASS)
+                size = min(SCAN_SLAB_SIZE, n - base)
+                j = 0
+            c1 = cls[j]
             
-            # Check for null terminator or control character
-            if b1 == 0x00 or (b1 < 0x20 and b1 not in (0x0A, 0x0D)):  # Allow newlines
-                break
-            
-            # Single-byte ASCII (including space)
-            if 0x20 <= b1 <= 0x7E:
-                string_bytes.append(b1)
-                i += 1
+            # Single-byte ASCII (including space) and newlines
+            if c1 & (CLS_ASCII | CLS_NEWLINE):
+                j += 1
                 continue
             
-            # Newline characters
-            if b1 in (0x0A, 0x0D):
-                string_bytes.append(b1)
-                i += 1
+            # Half-width katakana: consume it, but the run is almost always
+            # binary garbage, so the whole span is dropped
+            if c1 & CLS_KANA:
+                has_kana = True
+                j += 1
                 continue
             
-            # Half-width katakana
-            if 0xA1 <= b1 <= 0xDF:
-                string_bytes.append(b1)
-                japanese_chars += 1
-                i += 1
+            # Double-byte character (anything else ends the string,
+            # including NUL and control characters)
+            if c1 & CLS_LEAD and j + 1 < len(cls) and cls[j + 1] & CLS_TRAIL:
+                # Hiragana, katakana, kanji and other Japanese characters
+                if c1 & CLS_JP_LEAD:
+                    japanese_chars += 1
+                j += 2
                 continue
             
-            # Double-byte character
-            if i + 1 < len(data):
-                b2 = data[i + 1]
-                if is_shift_jis_char(b1, b2):
-                    string_bytes.extend([b1, b2])
-                    # Count as Japanese if hiragana, katakana, or kanji
-                    if is_hiragana_sjis(b1, b2) or is_katakana_sjis(b1, b2):
-                        japanese_chars += 1
-                    elif (0x81 <= b1 <= 0x9F) or (0xE0 <= b1 <= 0xEF):
-                        # Likely kanji or other Japanese character
-                        japanese_chars += 1
-                    i += 2
-                    continue
-            
             break
         
-        # Check if we found a valid Japanese string
-        if len(string_bytes) >= min_length and japanese_chars >= min_japanese:
-            try:
-                decoded = bytes(string_bytes).decode('shift-jis', errors='replace')
-                # Clean up the string
-                decoded = decoded.strip()
-                if len(decoded) >= min_length:
-                    # Skip strings that are mostly garbage
-                    if not is_garbage_string(decoded):
-                        results.append((start, decoded))
-            except:
-                pass
+        end = base + j
+        if not has_kana:
+            yield start, end, japanese_chars
         
-        if i == start:
-            i += 1
-    
-    return results
+        if end == start:
+            j += 1
 
 
-def is_garbage_string(s: str) -> bool:
-    """Check if a string is likely garbage/binary data"""
-    # Count replacement characters
-    if '\ufffd' in s:
-        return True
-    
-    # Reject strings with regular ASCII letters/numbers/punctuation
-    # Real Japanese game text uses fullwidth for these
-    garbage_ascii = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,;:!?()[]{}/<>\\|`~@#$%^&*-_=+\'"')
+def extract_strings(data: bytes, min_length: int = 3, min_japanese: int = 1) -> List[Tuple[int, str]]:
+    """
+    Extract Japanese text strings from binary data.
     
-    for c in s:
-        if c in garbage_ascii:
-            return True
+    Args:
+        data: Binary data to scan
+        min_length: Minimum string length to include
+        min_japanese: Minimum number of Japanese characters required
     
-    # Count different character types
-    hiragana = 0
-    katakana = 0
-    kanji = 0
-    fullwidth_ascii = 0
-    punctuation = 0
-    garbage_chars = 0
-    halfwidth_kana = 0
-    spaces = 0
+    Returns:
+        List of (offset, decoded_string) tuples
+    """
+    results = []
     
-    for c in s:
-        cp = ord(c)
-        # Hiragana: U+3040-U+309F
-        if 0x3040 <= cp <= 0x309F:
-            hiragana += 1
-        # Katakana: U+30A0-U+30FF
-        elif 0x30A0 <= cp <= 0x30FF:
-            katakana += 1
-        # CJK Unified Ideographs (Kanji): U+4E00-U+9FFF
-        elif 0x4E00 <= cp <= 0x9FFF:
-            kanji += 1
-        # Fullwidth ASCII: U+FF01-U+FF5E (fullwidth ! to ~)
-        elif 0xFF01 <= cp <= 0xFF5E:
-            fullwidth_ascii += 1
-        # Japanese punctuation
-        elif c in '。、！？「」『』（）・ー〜：；…―':
-            punctuation += 1
-        # Half-width katakana (often garbage in binary misreads)
-        elif 0xFF61 <= cp <= 0xFF9F:
-            halfwidth_kana += 1
-        # Spaces (both regular and fullwidth)
-        elif c == ' ' or c == '　':
-            spaces += 1
-        # Newlines
-        elif c in '\r\n':
+    for start, end, japanese_chars in _scan_spans(data):
+        # Check if we found a valid Japanese string
+        if end - start < min_length or japanese_chars < min_japanese:
+            continue
+        try:
+            decoded = data[start:end].decode('shift-jis', errors='replace')
+            # Clean up the string
+            decoded = decoded.strip()
+            if len(decoded) >= min_length:
+                # Skip strings that are mostly garbage
+                if not is_garbage_string(decoded):
+                    results.append((start, decoded))
+        except:
             pass
-        else:
-            garbage_chars += 1
     
-    japanese_chars = hiragana + katakana + kanji
+    return results
+
+
+def _build_char_class() -> dict:
+    """
+    Build the str.translate table used by is_garbage_string.
+    
+    Maps each codepoint to a one-letter category tag. Earlier entries win,
+    so overlapping ranges resolve in the order listed below.
+    Characters not in the table pass through untouched and count as garbage.
+    """
+    table = {}
+    
+    def tag(chars, t):
+        for c in chars:
+            table.setdefault(ord(c) if isinstance(c, str) else c, t)
     
-    # Reject if ANY half-width katakana (almost always binary garbage)
-    if halfwidth_kana > 0:
+    # Regular ASCII letters/numbers/punctuation and the replacement
+    # character reject the string outright.
+    # Real Japanese game text uses fullwidth for these
+    tag('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.,;:!?()[]{}/<>\\|`~@#$%^&*-_=+\'"', 'G')
+    tag('\ufffd', 'G')
+    tag(range(0x3040, 0x30A0), 'H')   # Hiragana
+    tag(range(0x30A0, 0x3100), 'K')   # Katakana
+    tag(range(0x4E00, 0xA000), 'J')   # CJK Unified Ideographs (Kanji)
+    tag(range(0xFF01, 0xFF5F), 'F')   # Fullwidth ASCII (fullwidth ! to ~)
+    tag('。、！？「」『』（）・ー〜：；…―', 'P')  # Japanese punctuation
+    tag(' 　', 'S')                   # Spaces (both regular and fullwidth)
+    tag('\r\n', 'L')                 # Newlines
+    return table
+
+
+CHAR_CLASS = _build_char_class()
+
+
+def is_garbage_string(s: str) -> bool:
+    """Check if a string is likely garbage/binary data"""
+    tagged = s.translate(CHAR_CLASS)
+    
+    # Replacement characters or regular ASCII
+    if 'G' in tagged:
         return True
     
+    japanese_chars = tagged.count('H') + tagged.count('K') + tagged.count('J')
+    fullwidth_ascii = tagged.count('F')
+    
     # Must have meaningful Japanese content
     if japanese_chars == 0 and fullwidth_ascii == 0:
         return True
     
-    # Too many garbage/unusual characters
-    if garbage_chars > 0:
+    # Too many garbage/unusual characters (anything left untagged)
+    known = japanese_chars + fullwidth_ascii + tagged.count('P') + tagged.count('S') + tagged.count('L')
+    if known != len(tagged):
         return True
     
     # Minimum content - at least 2 Japanese chars or fullwidth
@@ -216,21 +216,22 @@ def extract_to_csv(input_file: str, output_file: str, min_length: int = 3, min_j
     """Extract strings from a binary file and save to CSV"""
     
     print(f"Reading: {input_file}")
-    with open(input_file, 'rb') as f:
-        data = f.read()
-    
-    print(f"File size: {len(data):,} bytes")
-    print(f"Extracting strings (min length: {min_length}, min Japanese chars: {min_japanese})...")
-    
-    strings = extract_strings(data, min_length, min_japanese)
+    if os.path.getsize(input_file) == 0:
+        strings = []
+    else:
+        # Map the file rather than reading it: the scanner only needs
+        # indexing and slicing, and the OS pages the data in on demand.
+        with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            print(f"File size: {len(data):,} bytes")
+            print(f"Extracting strings (min length: {min_length}, min Japanese chars: {min_japanese})...")
+            
+            strings = extract_strings(data, min_length, min_japanese)
     
     # Remove duplicates while preserving order
-    seen = set()
-    unique_strings = []
+    first_offset = {}
     for offset, text in strings:
-        if text not in seen:
-            seen.add(text)
-            unique_strings.append((offset, text))
+        first_offset.setdefault(text, offset)
+    unique_strings = [(offset, text) for text, offset in first_offset.items()]
     
     print(f"Found {len(strings)} strings ({len(unique_strings)} unique)")
     
@@ -239,8 +240,7 @@ def extract_to_csv(input_file: str, output_file: str, min_length: int = 3, min_j
     with open(output_file, 'w', encoding='utf-8', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['japanese', 'english', 'offset', 'notes'])
-        for offset, text in unique_strings:
-            writer.writerow([text, '', f'0x{offset:08X}', ''])
+        writer.writerows((text, '', f'0x{offset:08X}', '') for offset, text in unique_strings)
     
     print(f"Done! Wrote {len(unique_strings)} entries to CSV")
 
@@ -18,9 +18,12 @@ Outputs:
 Columns: Japanese, English (blank), offset (hex)
 """
 
-import csv
+import mmap
+import re
 from pathlib import Path
 
+from csv_utils import WRITE_BUFFER_SIZE, csv_quote
+
 PROJECT_DIR = Path(__file__).parent.parent
 EXTRACTED_DIR = PROJECT_DIR / "extracted-afs" / "MGDATA"
 TRANSLATIONS_DIR = PROJECT_DIR / "translations"
@@ -33,9 +36,16 @@ FILES = [
 ]
 
 
-def is_sjis_lead(b: int) -> bool:
-    """Check if byte is a Shift-JIS lead byte (starts a 2-byte character)."""
-    return (0x81 <= b <= 0x9F) or (0xE0 <= b <= 0xEF)
+# One string: any run of Shift-JIS double-byte characters (lead + any trail,
+# so a 0x40 trail byte is consumed) or other non-@ bytes, then the standalone
+# @ terminator and any NUL padding that follows it. Matching this in the regex
+# engine replaces a Python-level loop over every byte of the table.
+STRING_RE = re.compile(
+    rb'((?:[\x81-\x9F\xE0-\xEF][\x00-\xFF]|[^@\x81-\x9F\xE0-\xEF])*)@\x00*'
+)
+
+# Joins raw strings so the table can be decoded in a single call (NUL + RS)
+DECODE_SEPARATOR = b'\x00\x1e'
 
 
 def extract_strings(data: bytes, start_offset: int) -> list:
@@ -46,52 +56,48 @@ def extract_strings(data: bytes, start_offset: int) -> list:
     is encountered, the next byte is a trail byte and is skipped -- even if it
     happens to be 0x40. Only a standalone 0x40 counts as the @ terminator.
 
-    Returns a list of dicts: { 'japanese': str, 'offset': str }
+    Returns a list of (japanese, offset) tuples, offset as a hex string.
     """
-    strings = []
+    offsets = []
+    raws = []
     pos = start_offset
-    string_start = pos
+    match = STRING_RE.match
 
     while pos < len(data):
-        b = data[pos]
+        m = match(data, pos)
+        if m is None:
+            break  # no terminator left
 
-        # Shift-JIS double-byte character: skip lead + trail
-        if is_sjis_lead(b) and pos + 1 < len(data):
-            pos += 2
-            continue
-
-        # Standalone @ terminator
-        if b == 0x40:
-            raw = data[string_start:pos]  # everything before the @
-            if len(raw) > 0:
-                text = raw.decode('shift_jis', errors='replace')
-                # Strip any stray NUL bytes that occasionally appear mid-string
-                text = text.replace('\x00', '')
-                strings.append({
-                    'japanese': text,
-                    'offset': f"0x{string_start:X}",
-                })
-            pos += 1
-            # Skip null padding bytes between strings
-            while pos < len(data) and data[pos] == 0x00:
-                pos += 1
-            string_start = pos
-            continue
+        raw = m.group(1)  # everything before the @
+        if len(raw) > 0:
+            offsets.append(pos)
+            raws.append(raw)
+        pos = m.end()
 
-        pos += 1
+    # Decode the whole table in one codec call. NUL is never a valid trail
+    # byte, so the separator always decodes back to itself and each string
+    # decodes exactly as it would on its own. If a string happens to contain
+    # the separator the split count is off; fall back to one call per string.
+    texts = DECODE_SEPARATOR.join(raws).decode('shift_jis', errors='replace').split('\x00\x1e')
+    if len(texts) != len(raws):
+        texts = [raw.decode('shift_jis', errors='replace') for raw in raws]
 
-    return strings
+    # Strip any stray NUL bytes that occasionally appear mid-string
+    return [(text.replace('\x00', ''), f"0x{offset:X}") for offset, text in zip(offsets, texts)]
 
 
 def write_csv(strings: list, output_path: Path):
-    """Write extracted strings to CSV."""
+    """
+    Write extracted strings to CSV.
+
+    Every field is quoted, so rows are formatted directly instead of going
+    through csv.writer; the output is byte-identical to csv.QUOTE_ALL.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f, quoting=csv.QUOTE_ALL, doublequote=True)
-        writer.writerow(["Japanese", "English", "offset"])
-        for s in strings:
-            writer.writerow([s['japanese'], "", s['offset']])
+    with open(output_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write('"Japanese","English","offset"\r\n')
+        f.writelines(f'{csv_quote(japanese)},"","{offset}"\r\n' for japanese, offset in strings)
 
     print(f"  Wrote {len(strings)} strings to {output_path}")
 
@@ -109,13 +115,16 @@ def main():
             continue
 
         print(f"\nProcessing {filepath}...")
-        with open(filepath, 'rb') as f:
-            data = f.read()
+        if filepath.stat().st_size == 0:
+            print(f"  WARNING: {filepath} is empty, skipping.")
+            continue
 
-        print(f"  File size: {len(data)} bytes (0x{len(data):X})")
-        print(f"  String table starts at: 0x{STRING_TABLE_START:X}")
+        # Map the file instead of reading it; only the decoded strings are copied
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            print(f"  File size: {len(data)} bytes (0x{len(data):X})")
+            print(f"  String table starts at: 0x{STRING_TABLE_START:X}")
 
-        strings = extract_strings(data, STRING_TABLE_START)
+            strings = extract_strings(data, STRING_TABLE_START)
         print(f"  Found {len(strings)} strings")
 
         output_path = TRANSLATIONS_DIR / csv_name
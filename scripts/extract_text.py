@@ -4,14 +4,120 @@ Extract Japanese text from Nekketsu Nikki game files for translation.
 Outputs CSV files ready for translators to fill in.
 """
 
-import csv
+import mmap
 import re
 from pathlib import Path
 
+from csv_utils import WRITE_BUFFER_SIZE, csv_quote
+
 PROJECT_DIR = Path(__file__).parent.parent
 EXTRACTED_DIR = PROJECT_DIR / "extracted-afs"
 TRANSLATIONS_DIR = PROJECT_DIR / "translations"
 
+# Dialog block header: !pXXXX (portrait) and !eXX (expression)
+DIALOG_HEADER_RE = re.compile(rb'!p[0-9a-fA-F]{4}!e[0-9]{2}')
+
+# Color-coded strings that end with @ but don't start with !p:
+# b'!c' and two decimal digits, not preceded by !, p or a hex digit
+COLORED_START_RE = re.compile(rb'!c[0-9]{2}')
+COLORED_BLOCKERS = frozenset(b'!p0123456789abcdefABCDEF')
+
+# Control codes and layout characters ignored when judging dialog content:
+# !cXX, !pXXXX, !eXX, !0, / and fullwidth space
+CONTROL_RE = re.compile(r'!c[0-9]{2}|!p[0-9a-fA-F]{4}|!e[0-9]{2}|!0|[/\u3000]')
+
+# Hiragana, katakana and CJK ideographs
+JAPANESE_RE = re.compile(r'[\u3040-\u30ff\u4e00-\u9fff]')
+
+
+def scan_dialog_blocks(data: bytes):
+    """
+    Find dialog blocks (!pXXXX!eXX followed by text until @) in raw bytes.
+    
+    Headers are found with DIALOG_HEADER_RE and the terminating @ with
+    bytes.find, so only the blocks themselves are decoded. The decoder
+    decides whether a candidate @ stands on its own or is the trail byte of
+    a double-byte character, so the blocks are the ones a match over the
+    fully decoded file would find.
+    
+    Yields (portrait_code, body) with the body decoded, excluding the
+    terminating @; the body is never empty.
+    """
+    match = DIALOG_HEADER_RE.search(data)
+    
+    while match:
+        body_start = match.end()
+        
+        # The header is ASCII, so body_start is a character boundary.
+        # Decode up to each candidate @; one the decoder pairs with the
+        # byte before it is part of that character, and the character ends
+        # there, so the next segment starts right after it.
+        segment = body_start
+        end = data.find(b'@', segment)
+        while end != -1:
+            text = data[segment:end + 1].decode('shift_jis', errors='replace')
+            if text.endswith('@'):
+                break
+            segment = end + 1
+            end = data.find(b'@', segment)
+        else:
+            return  # no terminator left anywhere after this point
+        
+        if end > body_start:
+            if segment != body_start:
+                text = data[body_start:end + 1].decode('shift_jis', errors='replace')
+            yield match.group().decode('ascii'), text[:-1]
+            match = DIALOG_HEADER_RE.search(data, end + 1)
+        else:
+            match = DIALOG_HEADER_RE.search(data, match.start() + 1)
+
+
+def scan_colored_blocks(data: bytes):
+    """
+    Find color-coded strings (!cXX followed by 5+ characters until @) in raw bytes.
+    
+    Only the candidates are decoded, never the whole file; the decoder still
+    decides where a character ends, so the result is the same as matching
+    over a full decode. A candidate directly after !, p or a hex digit is
+    skipped unless that byte is the trail of a double-byte character; only
+    then is the short run before it decoded to find out.
+    
+    Yields the decoded strings, including the !cXX prefix but not the @.
+    """
+    blockers = COLORED_BLOCKERS
+    match = COLORED_START_RE.search(data)
+    
+    while match:
+        start = match.start()
+        
+        if start and data[start - 1] in blockers:
+            # Bytes below 0x40 are never trail bytes, so decoding from just
+            # after the last one reproduces the character before start
+            run = start - 1
+            while run and data[run - 1] >= 0x40:
+                run -= 1
+            prev = data[run:start].decode('shift_jis', errors='replace')[-1]
+            if ord(prev) in blockers:
+                match = COLORED_START_RE.search(data, start + 1)
+                continue
+        
+        # The body ends at the first @ the decoder sees on its own; an @
+        # that it pairs with the byte before is part of that character
+        end = data.find(b'@', start + 4)
+        while end != -1:
+            text = data[start:end + 1].decode('shift_jis', errors='replace')
+            if text[-1] == '@':
+                break
+            end = data.find(b'@', end + 1)
+        else:
+            return  # no terminator left anywhere after this point
+        
+        if len(text) >= 10:
+            yield text[:-1]
+            match = COLORED_START_RE.search(data, end + 1)
+        else:
+            match = COLORED_START_RE.search(data, start + 1)
+
 
 def extract_dialog_strings(file_path: Path) -> list:
     """
@@ -26,46 +132,33 @@ def extract_dialog_strings(file_path: Path) -> list:
     
     Returns list of dicts with japanese, context info
     """
-    with open(file_path, 'rb') as f:
-        data = f.read()
-    
-    text = data.decode('shift_jis', errors='replace')
-    
     strings = []
     
-    # Pattern to find dialog blocks: !pXXXX!eXX followed by text until @
-    # Also captures standalone color-coded text
-    pattern = r'(!p[0-9a-fA-F]{4}!e[0-9]{2})([^@]+)@'
+    if file_path.stat().st_size == 0:
+        return strings
     
-    matches = re.finditer(pattern, text)
-    
-    for match in matches:
-        portrait_code = match.group(1)
-        dialog_text = match.group(2).strip()
-        
-        # Skip empty or very short strings
-        if len(dialog_text) < 2:
-            continue
-        
-        # Skip if it's mostly control codes
-        clean_text = re.sub(r'!c[0-9]{2}', '', dialog_text)
-        clean_text = re.sub(r'!p[0-9a-fA-F]{4}', '', clean_text)
-        clean_text = re.sub(r'!e[0-9]{2}', '', clean_text)
-        clean_text = re.sub(r'!0', '', clean_text)
-        clean_text = clean_text.replace('/', '').replace('　', '').strip()
-        
-        if len(clean_text) < 2:
-            continue
-        
-        # Check if it contains Japanese characters
-        has_japanese = any('\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff' for c in clean_text)
-        
-        if has_japanese:
-            strings.append({
-                'japanese': dialog_text,
-                'portrait': portrait_code,
-                'context': f'Portrait: {portrait_code}'
-            })
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Only the matched bodies are decoded, never the whole file
+        for portrait_code, body in scan_dialog_blocks(data):
+            dialog_text = body.strip()
+            
+            # Skip empty or very short strings
+            if len(dialog_text) < 2:
+                continue
+            
+            # Skip if it's mostly control codes
+            clean_text = CONTROL_RE.sub('', dialog_text).strip()
+            
+            if len(clean_text) < 2:
+                continue
+            
+            # Check if it contains Japanese characters
+            if JAPANESE_RE.search(clean_text):
+                strings.append({
+                    'japanese': dialog_text,
+                    'portrait': portrait_code,
+                    'context': f'Portrait: {portrait_code}'
+                })
     
     return strings
 
@@ -75,31 +168,19 @@ def extract_colored_strings(file_path: Path) -> list:
     Extract color-coded strings (like player selection menu).
     These start with !cXX and may not have portrait codes.
     """
-    with open(file_path, 'rb') as f:
-        data = f.read()
-    
-    text = data.decode('shift_jis', errors='replace')
-    
     strings = []
     
-    # Find color-coded strings that end with @ but don't start with !p
-    # These are typically menu items
-    pattern = r'(?<![!p0-9a-fA-F])(!c[0-9]{2}[^@]{5,})@'
+    if file_path.stat().st_size == 0:
+        return strings
     
-    matches = re.finditer(pattern, text)
-    seen = set()
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Find color-coded strings that end with @ but don't start with !p
+        # These are typically menu items
+        candidates = dict.fromkeys(text.strip() for text in scan_colored_blocks(data))
     
-    for match in matches:
-        colored_text = match.group(1).strip()
-        
-        if colored_text in seen:
-            continue
-        seen.add(colored_text)
-        
+    for colored_text in candidates:
         # Check if contains Japanese
-        has_japanese = any('\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff' for c in colored_text)
-        
-        if has_japanese:
+        if JAPANESE_RE.search(colored_text):
             strings.append({
                 'japanese': colored_text,
                 'context': 'Color-coded menu/UI text'
@@ -109,41 +190,36 @@ def extract_colored_strings(file_path: Path) -> list:
 
 
 def write_csv(strings: list, output_path: Path, include_english=True):
-    """Write extracted strings to a CSV file."""
+    """
+    Write extracted strings to a CSV file.
+    
+    Every field is quoted, so rows are formatted directly instead of going
+    through csv.DictWriter; the output is byte-identical to csv.QUOTE_ALL.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+    with open(output_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as f:
         if include_english:
-            fieldnames = ['japanese', 'english', 'context', 'notes']
+            f.write('"japanese","english","context","notes"\r\n')
+            row_format = '{},"",{},{}\r\n'
         else:
-            fieldnames = ['japanese', 'context', 'notes']
-        
-        writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
-        writer.writeheader()
+            f.write('"japanese","context","notes"\r\n')
+            row_format = '{},{},{}\r\n'
         
-        for s in strings:
-            row = {
-                'japanese': s['japanese'],
-                'context': s.get('context', ''),
-                'notes': s.get('notes', '')
-            }
-            if include_english:
-                row['english'] = ''
-            writer.writerow(row)
+        f.writelines(
+            row_format.format(csv_quote(s['japanese']), csv_quote(s.get('context', '')), csv_quote(s.get('notes', '')))
+            for s in strings
+        )
     
     print(f"Wrote {len(strings)} strings to {output_path}")
 
 
 def deduplicate_strings(strings: list) -> list:
     """Remove duplicate Japanese strings, keeping first occurrence."""
-    seen = set()
-    unique = []
+    unique = {}
     for s in strings:
-        jp = s['japanese']
-        if jp not in seen:
-            seen.add(jp)
-            unique.append(s)
-    return unique
+        unique.setdefault(s['japanese'], s)
+    return list(unique.values())
 
 
 def main():
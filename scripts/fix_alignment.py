@@ -12,8 +12,15 @@ Rules (from testing):
 - ... → … saves 1 byte when at even position
 """
 import csv
+import re
+from functools import lru_cache
 from pathlib import Path
 
+from csv_utils import replace_file
+
+
+# Widest a line can be in the text window, in bytes
+MAX_LINE_BYTES = 39
 
 FORMAT_CODE_PATTERNS = {
     '0': 2, '1': 2, '2': 2, '3': 2, '4': 2,
@@ -22,66 +29,56 @@ FORMAT_CODE_PATTERNS = {
     'c': 4, 'p': 6, 'e': 4,
 }
 
+# Format code letters that only change state and display nothing:
+# c (color), p (portrait), e (expression). Buttons (!a, !b, !x, !y, !h) and
+# player names (!0-!9) are visible.
+INVISIBLE_FORMAT_CODES = frozenset('cpe')
 
-def get_format_code_length(text: str, pos: int) -> int:
-    """Return character length of format code at pos, or 0 if not a format code."""
-    if pos >= len(text) or text[pos] != '!' or pos + 1 >= len(text):
-        return 0
-    return FORMAT_CODE_PATTERNS.get(text[pos + 1], 0)
+# Format code letters for player names (!0-!9), shown as up to 10 bytes
+PLAYER_NAME_CODES = frozenset('0123456789')
 
+# Runs of two or more spaces, collapsed to one in a single pass
+MULTI_SPACE_RE = re.compile(r' {2,}')
 
-def is_invisible_format_code(text: str, pos: int) -> bool:
-    """
-    Check if format code at pos is invisible (just changes state, no display).
-    Invisible: !c## (color), !p#### (portrait), !e## (expression)
-    Visible: !a, !b, !x, !y (buttons), !0-!9 (player names)
-    """
-    if pos + 1 >= len(text) or text[pos] != '!':
-        return False
-    next_char = text[pos + 1]
-    # Invisible codes: c (color), p (portrait), e (expression)
-    return next_char in 'cpe'
+# Anything process_text may change in an ASCII row: backslash, /, !,
+# double space, ... or a trailing space
+NEEDS_PROCESSING_RE = re.compile(r'[\\/!]|  |\.\.\.| $')
 
+# A / after an odd number of characters since the last space or / (for ASCII
+# text that is an odd byte position)
+ODD_SLASH_RE = re.compile(r'(?:^|[ /])[^ /](?:[^ /]{2})*/')
 
-def get_position_for_format_code(text: str, char_index: int) -> int:
+
+def get_char_bytes(text: str) -> int:
     """
-    Get byte position for format code alignment.
-    Format codes count as 0 bytes (they're invisible).
-    Resets on space or /.
+    Byte count used for alignment: 1 per ASCII character, 2 for anything else.
+    Same as summing 1 if ord(c) < 128 else 2, but the counting happens in C.
     """
-    segment_start = 0
-    for i in range(char_index):
-        if text[i] in ' /':
-            segment_start = i + 1
-    
-    pos, i = 0, segment_start
-    while i < char_index and i < len(text):
-        fc_len = get_format_code_length(text, i)
-        if fc_len > 0:
-            # Format codes = 0 bytes (invisible, don't affect alignment)
-            i += fc_len
-        else:
-            pos += 1 if ord(text[i]) < 128 else 2
-            i += 1
-    return pos
+    if text.isascii():
+        return len(text)
+    return 2 * len(text) - len(text.encode('ascii', 'ignore'))
 
 
-def get_position_for_slash(text: str, char_index: int) -> int:
+def get_format_code_length(text: str, pos: int) -> int:
+    """Return character length of format code at pos, or 0 if not a format code."""
+    if pos >= len(text) or text[pos] != '!' or pos + 1 >= len(text):
+        return 0
+    return FORMAT_CODE_PATTERNS.get(text[pos + 1], 0)
+
+
+def get_tail_position(pieces: list) -> int:
     """
-    Get byte position for / alignment.
-    Format codes count as their FULL character length (not 1 byte).
-    Resets on space or /.
+    Byte position for / alignment at the end of ''.join(pieces): bytes since
+    the last space or /, with format codes counted at their full length.
+    Only walks back to that space or / instead of joining and rescanning
+    the whole output.
     """
-    segment_start = 0
-    for i in range(char_index):
-        if text[i] in ' /':
-            segment_start = i + 1
-    
-    pos, i = 0, segment_start
-    while i < char_index and i < len(text):
-        # For / alignment, count all characters by their actual byte size
-        pos += 1 if ord(text[i]) < 128 else 2
-        i += 1
+    pos = 0
+    for piece in reversed(pieces):
+        segment_start = max(piece.rfind(' '), piece.rfind('/')) + 1
+        pos += get_char_bytes(piece[segment_start:])
+        if segment_start:
+            break
     return pos
 
 
@@ -89,18 +86,52 @@ def fix_all_left_to_right(text: str) -> str:
     """
     Process text left to right, fixing issues as we encounter them.
     Each fix is applied immediately, affecting all subsequent positions.
+    
+    Byte positions since the last space or / are tracked while the output
+    is built instead of being recomputed from the joined output for every
+    character:
+    - slash_pos: for / alignment, format codes count at their full length
+    - code_pos: for format code alignment, format codes count as 0 bytes; a
+      ! followed by a format code letter is taken back out and the rest of
+      the code is skipped
     """
+    # ASCII text without ! has nothing to fix unless a / sits at an odd position
+    if text.isascii() and '!' not in text and not ODD_SLASH_RE.search(text):
+        return text
+    
     result = []
-    i = 0
+    slash_pos = code_pos = code_skip = 0
+    after_bang = False
+    
+    def emit(piece):
+        nonlocal slash_pos, code_pos, code_skip, after_bang
+        result.append(piece)
+        for c in piece:
+            if c == ' ' or c == '/':
+                # Space or / starts a new segment for both positions
+                slash_pos = code_pos = code_skip = 0
+                after_bang = False
+                continue
+            width = 1 if ord(c) < 128 else 2
+            slash_pos += width
+            if code_skip:
+                code_skip -= 1
+            elif after_bang and c in FORMAT_CODE_PATTERNS:
+                # The previous ! starts a format code: 0 bytes in total
+                code_pos -= 1
+                code_skip = FORMAT_CODE_PATTERNS[c] - 2
+                after_bang = False
+            else:
+                code_pos += width
+                after_bang = c == '!'
     
+    i = 0
     while i < len(text):
         char = text[i]
-        current = ''.join(result)
         
         if char == '/':
             # Check / alignment (format codes count as full length)
-            pos = get_position_for_slash(current, len(current))
-            if pos % 2 != 0:
+            if slash_pos % 2 != 0:
                 # ODD position - need to add space
                 # If preceded by fullwidth chars, insert space BEFORE them
                 # (so fullwidth chars stay at even position)
@@ -108,83 +139,81 @@ def fix_all_left_to_right(text: str) -> str:
                 while insert_pos > 0 and ord(result[insert_pos - 1]) >= 128:
                     insert_pos -= 1
                 result.insert(insert_pos, ' ')
-            result.append('/')
+            emit('/')
             i += 1
             
         elif char == '!':
             fc_len = get_format_code_length(text, i)
             if fc_len > 0:
                 # Format code - check alignment (format codes count as 0 bytes)
-                pos = get_position_for_format_code(current, len(current))
+                pos = code_pos
                 has_space_before = result and result[-1] == ' '
                 after_pos = i + fc_len
                 has_space_after = after_pos < len(text) and text[after_pos] == ' '
-                invisible = is_invisible_format_code(text, i)
+                # A format code was found at i, so text[i + 1] is its letter
+                invisible = text[i + 1] in INVISIBLE_FORMAT_CODES
                 
                 # For visible codes, ensure space BEFORE if preceded by letter
                 if not invisible and not has_space_before and result and result[-1].isalpha():
-                    result.append(' ')
+                    emit(' ')
                     has_space_before = True  # Update for subsequent logic
                 
                 if pos % 2 != 0:
                     # ODD position - need to shift by 1
                     if has_space_after and not has_space_before and invisible:
                         # Move space from after to before (only for invisible codes)
-                        result.append(' ')
-                        result.append(text[i:i + fc_len])
+                        emit(' ')
+                        emit(text[i:i + fc_len])
                         i = after_pos + 1  # Skip the space after
                     else:
                         # Add space before (for alignment)
                         if not has_space_before:
-                            result.append(' ')
-                        result.append(text[i:i + fc_len])
+                            emit(' ')
+                        emit(text[i:i + fc_len])
                         i += fc_len
                         # If invisible and had space both before and after, skip after
                         if invisible and has_space_before and has_space_after:
                             i += 1
                         # For visible codes, ADD space after if next char is a letter
                         elif not invisible and i < len(text) and text[i].isalpha():
-                            result.append(' ')
+                            emit(' ')
                 else:
                     # EVEN position - OK
-                    result.append(text[i:i + fc_len])
+                    emit(text[i:i + fc_len])
                     i += fc_len
                     # Only skip trailing space for invisible codes to avoid visual double
                     if invisible and has_space_before and has_space_after:
                         i += 1
                     # For visible codes, ADD space after if next char is a letter
                     elif not invisible and i < len(text) and text[i].isalpha():
-                        result.append(' ')
+                        emit(' ')
             else:
                 # Literal ! - check if it will render
-                pos = get_position_for_slash(current, len(current))
-                if pos % 2 == 0:
+                if slash_pos % 2 == 0:
                     # EVEN position - won't render, use fullwidth
-                    result.append('！')
+                    emit('！')
                 else:
                     # ODD position - will render
-                    result.append('!')
+                    emit('!')
                 i += 1
         elif char == '！':
             # Fullwidth ！ - check position
-            pos = get_position_for_slash(current, len(current))
-            if pos % 2 != 0:
+            if slash_pos % 2 != 0:
                 # ODD position - fullwidth would break, use halfwidth
-                result.append('!')
+                emit('!')
             else:
                 # EVEN position - fullwidth OK
-                result.append('！')
+                emit('！')
             i += 1
         elif ord(char) >= 128:
             # Other fullwidth/2-byte characters - need EVEN position
-            pos = get_position_for_slash(current, len(current))
-            if pos % 2 != 0:
+            if slash_pos % 2 != 0:
                 # ODD position - add space before to shift to EVEN
-                result.append(' ')
-            result.append(char)
+                emit(' ')
+            emit(char)
             i += 1
         else:
-            result.append(char)
+            emit(char)
             i += 1
     
     return ''.join(result)
@@ -193,8 +222,8 @@ def fix_all_left_to_right(text: str) -> str:
 def cleanup(text: str) -> str:
     """Remove unnecessary characters."""
     text = text.replace('\\', '')
-    while '  ' in text:
-        text = text.replace('  ', ' ')
+    if '  ' in text:
+        text = MULTI_SPACE_RE.sub(' ', text)
     # Remove spaces around / - fix_alignment will add back if needed
     text = text.replace(' /', '/')
     text = text.replace('/ ', '/')
@@ -209,17 +238,18 @@ def fix_ellipsis(text: str) -> str:
     
     text = text.replace('…', '...')
     
+    # Jump from one ... to the next, copying the text in between as-is
     result = []
     i = 0
-    while i < len(text):
-        if text[i:i+3] == '...':
-            current = ''.join(result)
-            byte_pos = get_position_for_slash(current, len(current))
-            result.append('…' if byte_pos % 2 == 0 else '...')
-            i += 3
-        else:
-            result.append(text[i])
-            i += 1
+    while True:
+        dots = text.find('...', i)
+        if dots == -1:
+            break
+        result.append(text[i:dots])
+        byte_pos = get_tail_position(result)
+        result.append('…' if byte_pos % 2 == 0 else '...')
+        i = dots + 3
+    result.append(text[i:])
     
     return ''.join(result)
 
@@ -241,28 +271,34 @@ def fix_literal_exclamations(text: str) -> str:
     - Literal ! at EVEN position = dropped (bad)
     - Fullwidth ！ at EVEN position = renders (good)
     """
+    # Both format codes and literal ! start with !; without one there is nothing to do
+    if '!' not in text:
+        return text
+    
+    # Jump from ! to ! and copy the text in between as one slice
     result = []
-    i = 0
-    while i < len(text):
+    start = 0
+    i = text.find('!')
+    while i != -1:
+        if i > start:
+            result.append(text[start:i])
         fc_len = get_format_code_length(text, i)
         if fc_len > 0:
             # Format code - keep as-is
             result.append(text[i:i + fc_len])
-            i += fc_len
-        elif text[i] == '!':
+            start = i + fc_len
+        else:
             # Literal ! - check position (use full char counting)
-            current = ''.join(result)
-            pos = get_position_for_slash(current, len(current))
+            pos = get_tail_position(result)
             if pos % 2 == 0:
                 # EVEN position - won't render, use fullwidth
                 result.append('！')
             else:
                 # ODD position - will render, keep as-is
                 result.append('!')
-            i += 1
-        else:
-            result.append(text[i])
-            i += 1
+            start = i + 1
+        i = text.find('!', start)
+    result.append(text[start:])
     return ''.join(result)
 
 
@@ -272,40 +308,59 @@ def fix_format_code_spaces(text: str) -> str:
     "word !c07 word" renders as "word  word" (bad)
     "word !c07word" renders as "word word" (good)
     """
+    if '!' not in text:
+        return text
+    
     result = []
-    i = 0
-    while i < len(text):
+    start = 0
+    i = text.find('!')
+    while i != -1:
         fc_len = get_format_code_length(text, i)
-        if fc_len > 0:
-            # Check if space before AND space after
-            has_space_before = result and result[-1] == ' '
-            after_pos = i + fc_len
-            has_space_after = after_pos < len(text) and text[after_pos] == ' '
-            
-            result.append(text[i:i + fc_len])
-            i += fc_len
-            
-            if has_space_before and has_space_after:
-                # Skip the space after (remove it)
-                i += 1
-        else:
-            result.append(text[i])
-            i += 1
+        if fc_len == 0:
+            # Literal ! - copied along with the text around it
+            i = text.find('!', i + 1)
+            continue
+        # Check if space before AND space after (a space directly before
+        # is part of the pending slice, never of the previous code). A code
+        # at the very start counts as having one, as it always has here.
+        has_space_before = i == 0 or (i > start and text[i - 1] == ' ')
+        after_pos = i + fc_len
+        has_space_after = after_pos < len(text) and text[after_pos] == ' '
+        
+        result.append(text[start:after_pos])
+        start = after_pos
+        
+        if has_space_before and has_space_after:
+            # Skip the space after (remove it)
+            start += 1
+        i = text.find('!', start)
+    result.append(text[start:])
     return ''.join(result)
 
 
 def process_text(text: str) -> str:
     """Apply all fixes in order."""
+    # Short ASCII rows with none of the trigger characters come back unchanged
+    # from every pass
+    if len(text) <= MAX_LINE_BYTES and text.isascii() and not NEEDS_PROCESSING_RE.search(text):
+        return text
     text = cleanup(text)
     text = fix_ellipsis(text)
     text = fix_long_lines(text)          # Move words to next line if too long
     text = fix_all_left_to_right(text)   # Fix alignment (/, format codes, !)
-    # Final cleanup to remove any double spaces introduced
-    while '  ' in text:
-        text = text.replace('  ', ' ')
+    # Final cleanup to remove any double spaces introduced (most rows have none,
+    # and the substring check is much cheaper than a regex pass that finds nothing)
+    if '  ' in text:
+        text = MULTI_SPACE_RE.sub(' ', text)
     return text
 
 
+@lru_cache(maxsize=65536)
+def _process_text_cached(text: str) -> str:
+    """process_text, memoized (the same English lines repeat across rows and files)."""
+    return process_text(text)
+
+
 def get_display_length(text: str) -> int:
     """
     Calculate display length of a line segment.
@@ -319,22 +374,28 @@ def get_display_length(text: str) -> int:
     length = 0
     i = 0
     while i < len(text):
+        # Everything up to the next ! is plain text
+        bang = text.find('!', i)
+        if bang == -1:
+            return length + get_char_bytes(text[i:])
+        length += get_char_bytes(text[i:bang])
+        i = bang
+        
         fc_len = get_format_code_length(text, i)
         if fc_len > 0:
             # Check which type of format code
-            next_char = text[i + 1] if i + 1 < len(text) else ''
-            if next_char.isdigit():
+            if text[i + 1] in PLAYER_NAME_CODES:
                 # !0-!9 player names = 10 bytes max
                 length += 10
             # !c, !p, !e, !a, !b, !x, !y = 0 display bytes
             i += fc_len
         else:
-            length += 1 if ord(text[i]) < 128 else 2
+            length += 1
             i += 1
     return length
 
 
-def fix_long_lines(text: str, max_bytes: int = 39) -> str:
+def fix_long_lines(text: str, max_bytes: int = MAX_LINE_BYTES) -> str:
     """
     Fix overly long lines by adjusting / positions or inserting new /.
     
@@ -344,13 +405,18 @@ def fix_long_lines(text: str, max_bytes: int = 39) -> str:
     """
     max_iterations = 50
     
+    # Work on the split segments directly and join once at the end; none of
+    # the edits below put a / inside a segment, so this matches re-splitting
+    # the joined text every iteration
+    segments = text.split('/')
+    # Segments before this index are known to fit, so the search resumes here
+    first_unchecked = 0
+    
     for _ in range(max_iterations):
-        segments = text.split('/')
-        
         # Find first problem
         problem_idx = None
-        for idx, segment in enumerate(segments):
-            if get_display_length(segment.rstrip(' ')) > max_bytes:
+        for idx in range(first_unchecked, len(segments)):
+            if get_display_length(segments[idx].rstrip(' ')) > max_bytes:
                 problem_idx = idx
                 break
         
@@ -359,6 +425,9 @@ def fix_long_lines(text: str, max_bytes: int = 39) -> str:
         
         fixed = False
         problem_segment = segments[problem_idx]
+        # Only the previous segment can change before problem_idx, and only
+        # when it stays within max_bytes
+        first_unchecked = problem_idx
         
         # Case: Last line too long
         if problem_idx == len(segments) - 1 and len(segments) > 1:
@@ -375,7 +444,6 @@ def fix_long_lines(text: str, max_bytes: int = 39) -> str:
                     new_last = problem_segment[first_space + 1:]
                     segments[-2] = new_prev
                     segments[-1] = new_last
-                    text = '/'.join(segments)
                     fixed = True
                 else:
                     # Can't move / right, insert new / in last line instead
@@ -383,8 +451,7 @@ def fix_long_lines(text: str, max_bytes: int = 39) -> str:
                     if last_space > 0:
                         new_current = problem_segment[:last_space]
                         new_next = problem_segment[last_space + 1:]
-                        segments = segments[:-1] + [new_current, new_next]
-                        text = '/'.join(segments)
+                        segments[-1:] = [new_current, new_next]
                         fixed = True
         
         # Case: Non-last line too long - move / LEFT
@@ -394,8 +461,7 @@ def fix_long_lines(text: str, max_bytes: int = 39) -> str:
                 new_current = problem_segment[:last_space]
                 new_next = problem_segment[last_space + 1:] + ' ' + segments[problem_idx + 1]
                 
-                parts = segments[:problem_idx] + [new_current, new_next] + segments[problem_idx + 2:]
-                text = '/'.join(parts)
+                segments[problem_idx:problem_idx + 2] = [new_current, new_next]
                 fixed = True
         
         # Case: Still not fixed - insert new /
@@ -405,17 +471,16 @@ def fix_long_lines(text: str, max_bytes: int = 39) -> str:
                 new_current = problem_segment[:last_space]
                 new_next = problem_segment[last_space + 1:]
                 
-                parts = segments[:problem_idx] + [new_current, new_next] + segments[problem_idx + 1:]
-                text = '/'.join(parts)
+                segments[problem_idx:problem_idx + 1] = [new_current, new_next]
                 fixed = True
         
         if not fixed:
             break  # Can't fix
     
-    return text
+    return '/'.join(segments)
 
 
-def find_long_lines(text: str, max_bytes: int = 39) -> list[tuple[int, str, int]]:
+def find_long_lines(text: str, max_bytes: int = MAX_LINE_BYTES) -> list[tuple[int, str, int]]:
     """
     Find line segments that exceed max_bytes.
     Returns list of (line_number, segment_text, byte_count).
@@ -433,25 +498,22 @@ def find_long_lines(text: str, max_bytes: int = 39) -> list[tuple[int, str, int]
 
 def fix_csv(csv_path: Path) -> dict:
     """Fix a MGDATA CSV file. Returns counts of changes."""
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
     changes = 0
 
-    for row in rows:
-        original = row.get('English', '')
-        if not original:
-            continue
-        fixed = process_text(original)
-        if fixed != original:
-            changes += 1
-            row['English'] = fixed
-
-    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f, quoting=csv.QUOTE_ALL, doublequote=True)
+    # Stream rows from the original into a replacement file, fixing them as
+    # we go
+    with open(csv_path, 'r', encoding='utf-8') as src, replace_file(csv_path) as dst:
+        reader = csv.DictReader(src)
+        writer = csv.writer(dst, quoting=csv.QUOTE_ALL, doublequote=True)
         writer.writerow(['Japanese', 'English', 'offset'])
-        for row in rows:
+
+        for row in reader:
+            original = row.get('English', '')
+            if original:
+                fixed = _process_text_cached(original)
+                if fixed != original:
+                    changes += 1
+                    row['English'] = fixed
             writer.writerow([row['Japanese'], row['English'], row['offset']])
 
     return {'changes': changes}
@@ -479,26 +541,23 @@ def fix_mgdata_files(translations_dir: Path):
 
 def report_long_lines(csv_path: Path) -> list:
     """Find all lines that are too long in a CSV file."""
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
     issues = []
 
-    for row_idx, row in enumerate(rows, start=2):
-        english = row.get('English', '')
-        if not english:
-            continue
-
-        problems = find_long_lines(english)
-        for line_num, segment, byte_count in problems:
-            issues.append({
-                'row': row_idx,
-                'line': line_num,
-                'bytes': byte_count,
-                'text': segment[:50] + ('...' if len(segment) > 50 else ''),
-                'full_text': english
-            })
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row_idx, row in enumerate(csv.DictReader(f), start=2):
+            english = row.get('English', '')
+            if not english:
+                continue
+
+            problems = find_long_lines(english)
+            for line_num, segment, byte_count in problems:
+                issues.append({
+                    'row': row_idx,
+                    'line': line_num,
+                    'bytes': byte_count,
+                    'text': segment[:50] + ('...' if len(segment) > 50 else ''),
+                    'full_text': english
+                })
 
     return issues
 
@@ -522,7 +581,7 @@ def report_long_lines_mgdata(translations_dir: Path):
                 print(f"    {issue['text']}")
             total_issues += len(issues)
 
-    print(f"\nTotal: {total_issues} lines over 39 bytes")
+    print(f"\nTotal: {total_issues} lines over {MAX_LINE_BYTES} bytes")
 
 
 if __name__ == "__main__":
@@ -533,7 +592,7 @@ if __name__ == "__main__":
 
     # Check for --check-length flag
     if len(sys.argv) > 1 and sys.argv[1] == '--check-length':
-        print("Checking for lines over 39 bytes...")
+        print(f"Checking for lines over {MAX_LINE_BYTES} bytes...")
         report_long_lines_mgdata(translations_dir)
     else:
         print("Fixing alignment...")
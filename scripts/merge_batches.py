@@ -2,14 +2,23 @@
 Merge translated batch CSV files back into a single file.
 """
 import csv
-import io
+import os
 from pathlib import Path
 
+from csv_utils import denul, replace_file
+
+# Output columns, written in this order
+FIELDNAMES = ('japanese', 'english', 'context', 'notes')
+
 def merge_batches(batch_dir: Path, output_file: Path):
     """Merge all batch CSV files back into one file."""
     
-    # Find all batch files, sorted by number
-    batch_files = sorted(batch_dir.glob("*_batch_*.csv"))
+    # Find all batch files, sorted by number (same files as
+    # batch_dir.glob("*_batch_*.csv"), from one directory scan)
+    batch_files = sorted(
+        Path(entry.path) for entry in os.scandir(batch_dir)
+        if '_batch_' in entry.name and entry.name.endswith('.csv') and entry.is_file()
+    )
     
     if not batch_files:
         print(f"ERROR: No batch files found in {batch_dir}")
@@ -17,32 +26,29 @@ def merge_batches(batch_dir: Path, output_file: Path):
     
     print(f"Found {len(batch_files)} batch files")
     
-    all_rows = []
+    total_rows = total_translated = 0
     
-    for batch_file in batch_files:
-        with open(batch_file, 'r', encoding='utf-8') as f:
-            content = f.read().replace('\x00', '')
-        
-        rows = list(csv.DictReader(io.StringIO(content)))
-        all_rows.extend(rows)
+    # Stream each batch straight into a replacement for the output file;
+    # only one batch is held in memory at a time
+    with replace_file(output_file) as dst:
+        # Plain csv.writer over value lists in FIELDNAMES order
+        writer = csv.writer(dst, quoting=csv.QUOTE_ALL)
+        writer.writerow(FIELDNAMES)
         
-        # Count translated lines in this batch
-        translated = sum(1 for r in rows if r.get('english'))
-        print(f"  {batch_file.name}: {len(rows)} strings, {translated} translated")
-    
-    # Write merged file
-    with open(output_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=['japanese', 'english', 'context', 'notes'],
-            quoting=csv.QUOTE_ALL
-        )
-        writer.writeheader()
-        writer.writerows(all_rows)
-    
-    total_translated = sum(1 for r in all_rows if r.get('english'))
-    print(f"\nMerged {len(all_rows)} strings into {output_file.name}")
-    print(f"Total translated: {total_translated}/{len(all_rows)} ({100*total_translated//len(all_rows)}%)")
+        for batch_file in batch_files:
+            # Read the batch (handle any NUL characters)
+            with open(batch_file, 'r', encoding='utf-8') as f:
+                rows = list(csv.DictReader(denul(f)))
+            writer.writerows([row.get(name, '') for name in FIELDNAMES] for row in rows)
+            
+            # Count translated lines in this batch
+            translated = sum(1 for r in rows if r.get('english'))
+            print(f"  {batch_file.name}: {len(rows)} strings, {translated} translated")
+            total_rows += len(rows)
+            total_translated += translated
+    
+    print(f"\nMerged {total_rows} strings into {output_file.name}")
+    print(f"Total translated: {total_translated}/{total_rows} ({100*total_translated//total_rows}%)")
 
 if __name__ == "__main__":
     project_dir = Path(__file__).parent.parent
@@ -9,6 +9,7 @@ Handles:
 """
 
 import csv
+import re
 import shutil
 from pathlib import Path
 
@@ -20,6 +21,12 @@ MODIFIED_AFS_DIR = PROJECT_DIR / "modified-afs-contents"
 MODIFIED_DISC_DIR = PROJECT_DIR / "modified-disc-files"
 TRANSLATIONS_DIR = PROJECT_DIR / "translations"
 
+# SJIS_LEAD[b] is 1 for Shift-JIS lead bytes (0x81-0x9F, 0xE0-0xEF), else 0
+SJIS_LEAD = bytes(1 if (0x81 <= b <= 0x9F) or (0xE0 <= b <= 0xEF) else 0 for b in range(256))
+
+# Run of NUL padding; NUL_RUN_RE.match(data, pos).end() - pos counts it
+NUL_RUN_RE = re.compile(rb'\x00*')
+
 
 def load_translations_from_csv(csv_path: Path) -> dict:
     """
@@ -85,15 +92,13 @@ def replace_text_in_file(input_file: Path, output_file: Path, replacements: dict
         pos = 0
         
         while True:
-            idx = bytes(modified).find(jp_bytes, pos)
+            idx = modified.find(jp_bytes, pos)
             if idx == -1:
                 break
             
             # Count trailing null bytes after the Japanese text
             text_end = idx + len(jp_bytes)
-            null_count = 0
-            while text_end + null_count < len(modified) and modified[text_end + null_count] == 0x00:
-                null_count += 1
+            null_count = NUL_RUN_RE.match(modified, text_end).end() - text_end
             
             # Available space: JP bytes + trailing nulls minus 1 (keep at least 1 null)
             if null_count > 0:
@@ -177,7 +182,7 @@ def replace_null_terminated_strings(input_file: Path, output_file: Path, replace
         
         pos = 0
         while True:
-            idx = bytes(modified).find(search_pattern, pos)
+            idx = modified.find(search_pattern, pos)
             if idx == -1:
                 break
             
@@ -192,9 +197,7 @@ def replace_null_terminated_strings(input_file: Path, output_file: Path, replace
             
             # Count trailing null bytes after the string (including the terminator)
             text_end = idx + len(jp_bytes)
-            null_count = 0
-            while text_end + null_count < len(modified) and modified[text_end + null_count] == 0x00:
-                null_count += 1
+            null_count = NUL_RUN_RE.match(modified, text_end).end() - text_end
             
             # Available space: the Japanese text bytes + trailing nulls minus 1 (keep at least 1 null)
             available = len(jp_bytes) + max(0, null_count - 1)
@@ -326,9 +329,7 @@ def replace_at_offsets(input_file: Path, output_file: Path, entries: list, pad_c
 
         # Count trailing NUL bytes after the '@'
         null_start = at_pos + 1  # byte after '@'
-        null_count = 0
-        while null_start + null_count < len(modified) and modified[null_start + null_count] == 0x00:
-            null_count += 1
+        null_count = NUL_RUN_RE.match(modified, null_start).end() - null_start
 
         # Available space for English text (before '@'):
         #   jp_span + null bytes we can consume (keep at least 1 NUL after '@')
@@ -382,13 +383,11 @@ def find_string_end_sjis(data: bytearray, start: int) -> int | None:
     """
     pos = start
     limit = min(start + 4096, len(data))  # don't scan too far
-
-    def is_sjis_lead(b):
-        return (0x81 <= b <= 0x9F) or (0xE0 <= b <= 0xEF)
+    lead = SJIS_LEAD
 
     while pos < limit:
         b = data[pos]
-        if is_sjis_lead(b) and pos + 1 < len(data):
+        if lead[b] and pos + 1 < len(data):
             pos += 2  # skip 2-byte Shift-JIS character
             continue
         if b == 0x40:  # standalone '@' terminator
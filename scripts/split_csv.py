@@ -2,19 +2,21 @@
 Split a large translation CSV into smaller batch files.
 """
 import csv
-import io
 from pathlib import Path
 
+from csv_utils import denul
+
 BATCH_SIZE = 100
 
+# Output columns, written in this order
+FIELDNAMES = ('japanese', 'english', 'context', 'notes')
+
 def split_csv(input_path: Path, output_dir: Path):
     """Split a CSV file into smaller batch files."""
     
     # Read the CSV (handle any NUL characters)
     with open(input_path, 'r', encoding='utf-8') as f:
-        content = f.read().replace('\x00', '')
-    
-    rows = list(csv.DictReader(io.StringIO(content)))
+        rows = list(csv.DictReader(denul(f)))
     total_rows = len(rows)
     
     # Create output directory
@@ -32,13 +34,10 @@ def split_csv(input_path: Path, output_dir: Path):
         batch_file = output_dir / f"{base_name}_batch_{batch_num:03d}.csv"
         
         with open(batch_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(
-                f, 
-                fieldnames=['japanese', 'english', 'context', 'notes'],
-                quoting=csv.QUOTE_ALL
-            )
-            writer.writeheader()
-            writer.writerows(batch_rows)
+            # Plain csv.writer over value lists in FIELDNAMES order
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+            writer.writerow(FIELDNAMES)
+            writer.writerows([row.get(name, '') for name in FIELDNAMES] for row in batch_rows)
         
         print(f"Created {batch_file.name} ({len(batch_rows)} strings)")
         batch_num += 1
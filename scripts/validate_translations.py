@@ -9,12 +9,21 @@ Rules:
 - ! format codes must be at even byte positions WITHIN THEIR LINE SEGMENT
 """
 import csv
-import io
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
+from csv_utils import denul
+
+# Format codes: !cXX, !pXXXX, !eXX, !0, !1, !a, !h, etc.
+FORMAT_CODE_RE = re.compile(r'![a-zA-Z0-9]+')
+
 def get_byte_length(text: str) -> int:
     """Get the Shift-JIS byte length of a string."""
+    # Pure ASCII is one byte per character in Shift-JIS; skip the codec
+    if text.isascii():
+        return len(text)
     try:
         return len(text.encode('shift-jis'))
     except UnicodeEncodeError:
@@ -27,26 +36,49 @@ def get_byte_length(text: str) -> int:
                 length += 2  # Japanese/fullwidth = 2 bytes
         return length
 
-def get_byte_position_in_line(text: str, char_index: int) -> int:
+@lru_cache(maxsize=4096)
+def _sjis_char_length(char: str) -> int:
+    """Shift-JIS byte length of one character, 0 if it can't be encoded."""
+    try:
+        return len(char.encode('shift-jis'))
+    except UnicodeEncodeError:
+        return 0
+
+def build_byte_index(text: str) -> tuple:
     """
-    Get byte position within the current line segment (after last /).
-    The game resets byte counting to 0 after each / line break.
+    Prefix sums for byte positions in text, built in a single pass.
+    
+    Returns (sjis, estimate, unencodable): for each i, the Shift-JIS and the
+    estimated (ASCII = 1, else 2) byte lengths of text[:i], and how many
+    characters of text[:i] Shift-JIS can't encode. Use span_byte_length()
+    to query it instead of re-measuring a prefix for every position.
     """
-    # Find the start of the current line (after the last /)
-    line_start = 0
-    for i in range(char_index):
-        if text[i] == '/':
-            line_start = i + 1
+    if text.isascii():
+        offsets = list(range(len(text) + 1))
+        return offsets, offsets, [0] * len(offsets)
     
-    # Calculate byte position from line start to char_index
-    return get_byte_length(text[line_start:char_index])
+    sjis = [0]
+    estimate = [0]
+    unencodable = [0]
+    for char in text:
+        width = _sjis_char_length(char)
+        sjis.append(sjis[-1] + width)
+        estimate.append(estimate[-1] + (1 if ord(char) < 128 else 2))
+        unencodable.append(unencodable[-1] + (width == 0))
+    return sjis, estimate, unencodable
+
+def span_byte_length(index: tuple, start: int, end: int) -> int:
+    """Same as get_byte_length(text[start:end]), using a build_byte_index(text) result."""
+    sjis, estimate, unencodable = index
+    if unencodable[end] == unencodable[start]:
+        return sjis[end] - sjis[start]
+    # Like get_byte_length: if any character fails to encode, estimate the whole span
+    return estimate[end] - estimate[start]
 
 def find_format_codes(text: str) -> list:
     """Find all ! format codes and their positions."""
-    # Match !cXX, !pXXXX, !eXX, !0, !1, !a, !h, etc.
-    pattern = r'![a-zA-Z0-9]+'
     codes = []
-    for match in re.finditer(pattern, text):
+    for match in FORMAT_CODE_RE.finditer(text):
         codes.append({
             'code': match.group(),
             'char_pos': match.start(),
@@ -61,25 +93,31 @@ def check_byte_alignment(text: str) -> list:
     - ! format codes: must be at even byte position WITHIN THEIR LINE
     """
     issues = []
+    # Without a / or a ! there is nothing to check
+    if '/' not in text and '!' not in text:
+        return issues
+    index = build_byte_index(text)
     
-    # Check / line breaks (overall position)
-    for i, char in enumerate(text):
-        if char == '/':
-            byte_pos = get_byte_length(text[:i])
-            if byte_pos % 2 != 0:
-                issues.append({
-                    'code': '/',
-                    'byte_pos': byte_pos,
-                    'position_type': 'overall',
-                    'text_before': text[max(0,i-20):i]
-                })
+    # Check / line breaks (overall position), jumping from one / to the next
+    i = text.find('/')
+    while i != -1:
+        byte_pos = span_byte_length(index, 0, i)
+        if byte_pos % 2 != 0:
+            issues.append({
+                'code': '/',
+                'byte_pos': byte_pos,
+                'position_type': 'overall',
+                'text_before': text[max(0,i-20):i]
+            })
+        i = text.find('/', i + 1)
     
     # Check ! format codes (per-line position)
     codes = find_format_codes(text)
     for code_info in codes:
         char_pos = code_info['char_pos']
-        # Use per-line byte position
-        byte_pos = get_byte_position_in_line(text, char_pos)
+        # Use per-line byte position (the line starts after the last / before the code)
+        line_start = text.rfind('/', 0, char_pos) + 1
+        byte_pos = span_byte_length(index, line_start, char_pos)
         
         if byte_pos % 2 != 0:
             issues.append({
@@ -96,29 +134,30 @@ def validate_csv(csv_path: Path) -> list:
     all_issues = []
     
     with open(csv_path, 'r', encoding='utf-8') as f:
-        content = f.read().replace('\x00', '')
-    
-    rows = list(csv.DictReader(io.StringIO(content)))
-    
-    for i, row in enumerate(rows, start=2):  # Start at 2 (header is line 1)
-        english = row.get('english', '')
-        if not english:
-            continue
-        
-        issues = check_byte_alignment(english)
-        if issues:
-            all_issues.append({
-                'line': i,
-                'japanese': row.get('japanese', '')[:40],
-                'english': english[:60],
-                'issues': issues
-            })
+        reader = csv.DictReader(denul(f))
+        for i, row in enumerate(reader, start=2):  # Start at 2 (header is line 1)
+            english = row.get('english', '')
+            if not english:
+                continue
+            
+            issues = check_byte_alignment(english)
+            if issues:
+                all_issues.append({
+                    'line': i,
+                    'japanese': row.get('japanese', '')[:40],
+                    'english': english[:60],
+                    'issues': issues
+                })
     
     return all_issues
 
 def validate_batch_dir(batch_dir: Path):
     """Validate all batch CSV files."""
-    batch_files = sorted(batch_dir.glob("*_batch_*.csv"))
+    # Same files as batch_dir.glob("*_batch_*.csv"), from one directory scan
+    batch_files = sorted(
+        Path(entry.path) for entry in os.scandir(batch_dir)
+        if '_batch_' in entry.name and entry.name.endswith('.csv') and entry.is_file()
+    )
     
     total_issues = 0
     